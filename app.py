@@ -1,4 +1,12 @@
+import json
+
 import streamlit as st
+from src.travel_planner.config import load_profiling_enabled
+from src.travel_planner.profiling import load_report, start_profiling
+
+# Start profiling before the heavy imports so their cost is measured
+start_profiling()
+
 from src.travel_planner.agent import run_agent
 from src.travel_planner.vector_store import vector_store_exists, create_vector_store
 
@@ -10,6 +18,45 @@ st.set_page_config(
     initial_sidebar_state="auto",
 )
 
+# --- Diagnostics Page (profiling mode only) ---
+if load_profiling_enabled():
+    page = st.sidebar.radio("Page", ["Agent", "Diagnostics"])
+    if page == "Diagnostics":
+        st.title("🩺 Diagnostics")
+        report = load_report()
+        if report is None:
+            st.info("No profiling report has been written yet.")
+        else:
+            st.subheader("Import timings")
+            st.caption(
+                "Heavy packages are timed when first imported; the phase column "
+                "shows which phase paid for the import (it is part of its timings)."
+            )
+            st.table(report["imports"])
+
+            st.subheader("Phases")
+            st.caption(
+                "thread_cpu_s is the CPU time of the session running the phase; "
+                "process_cpu_s also includes other sessions running at the same time."
+            )
+            st.dataframe(
+                [
+                    {k: v for k, v in phase.items() if k != "growth_by_package"}
+                    for phase in report["phases"]
+                ]
+            )
+
+            st.subheader("Memory growth since startup by package")
+            phases = [p for p in report["phases"] if "growth_by_package" in p]
+            if phases:
+                st.caption(f"After the last '{phases[-1]['phase']}' phase")
+                st.table(phases[-1]["growth_by_package"])
+
+            st.download_button(
+                "Download report", json.dumps(report, indent=2), "profile_report.json"
+            )
+        st.stop()
+
 # --- App State Management ---
 if 'vector_store_built' not in st.session_state:
     st.session_state.vector_store_built = vector_store_exists()
@@ -1,4 +1,9 @@
 import argparse
+from src.travel_planner.profiling import start_profiling
+
+# Start profiling before the heavy imports so their cost is measured
+start_profiling()
+
 from src.travel_planner.agent import run_agent
 
 
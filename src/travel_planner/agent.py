@@ -4,9 +4,11 @@ from langchain.tools.render import render_text_description
 from langchain_huggingface import ChatHuggingFace, HuggingFaceEndpoint
 
 from .config import load_huggingface_api_key
-from .tools import ask_book_tool, weather_tool
+from .profiling import profile_phase
+from .tools import ask_book_tool, book_index_tool, weather_tool
 
 
+@profile_phase("create_agent")
 def create_agent():
     """
     Creates and returns an AI agent that uses the "structured chat" method,
@@ -14,7 +16,8 @@ def create_agent():
     """
     # collect the list of tools the agent can use
     book_tool = ask_book_tool()
-    all_tools = [weather_tool, book_tool]
+    index_tool = book_index_tool()
+    all_tools = [weather_tool, book_tool, index_tool]
 
     # Get the prompt template from LangChain Hub
     prompt = hub.pull("hwchase17/structured-chat-agent")
@@ -65,6 +68,7 @@ def create_agent():
     return agent_executor
 
 
+@profile_phase("query")
 def run_agent(query: str):
     """
     Runs the agent with a given user query.
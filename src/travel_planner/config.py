@@ -27,3 +27,14 @@ def load_openweathermap_api_key():
         raise ValueError("OPENWEATHERMAP_API_KEY is not set in environment variables.")
 
     return openweathermap_api_key
+
+
+def load_profiling_enabled():
+
+    # Retrieve the profiling switch from environment variables
+    load_dotenv()
+
+    # Profiling is opt-in, e.g. TRAVEL_PLANNER_PROFILE=1
+    profiling_flag = os.getenv("TRAVEL_PLANNER_PROFILE", "")
+
+    return profiling_flag.strip().lower() in ("1", "true", "yes", "on")
@@ -0,0 +1,223 @@
+import builtins
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+from .config import load_profiling_enabled
+
+PROFILE_REPORT_PATH = "data/profile_report.json"
+
+# Heavy third-party packages whose import cost is recorded when they are first imported
+PROFILED_IMPORTS = [
+    "torch",
+    "sentence_transformers",
+    "faiss",
+    "langchain",
+    "langchain_community",
+    "langchain_huggingface",
+]
+
+# Keep the report bounded in long-running Streamlit processes
+MAX_RECORDED_PHASES = 200
+TOP_ALLOCATIONS = 10
+
+_report: dict[str, list[dict]] = {"imports": [], "phases": []}
+_report_lock = threading.RLock()
+_enabled = False
+_baseline_snapshot = None
+_original_import = builtins.__import__
+
+# Streamlit runs each session in its own thread, so the phases being run are
+# tracked per thread/context, while the number of active outermost phases is
+# shared to know when the tracemalloc peak can be reset.
+_phase_stack: ContextVar[tuple] = ContextVar("phase_stack", default=())
+_active_phases = 0
+
+
+def start_profiling():
+    """
+    Starts tracemalloc (unless something else already did, e.g. PYTHONTRACEMALLOC)
+    and installs the import hook that times the heavy imports.
+    Does nothing unless profiling is enabled, or if profiling already started
+    (Streamlit re-runs the app script on every interaction).
+    """
+    global _enabled, _baseline_snapshot
+
+    with _report_lock:
+        if _enabled or not load_profiling_enabled():
+            return
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        _baseline_snapshot = tracemalloc.take_snapshot()
+        builtins.__import__ = _timed_import
+        _enabled = True
+        write_report()
+
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    """
+    Wraps the built-in __import__ to record the first import of each package
+    in PROFILED_IMPORTS, with the phase it happened in. Import times are
+    inclusive: a package imported by another one counts for both.
+    """
+    package = name.partition(".")[0]
+    if level != 0 or package not in PROFILED_IMPORTS or package in sys.modules:
+        return _original_import(name, globals, locals, fromlist, level)
+
+    wall_start, thread_cpu_start = time.perf_counter(), time.thread_time()
+    module = _original_import(name, globals, locals, fromlist, level)
+    stack = _phase_stack.get()
+    with _report_lock:
+        _report["imports"].append(
+            {
+                "module": package,
+                "wall_s": time.perf_counter() - wall_start,
+                "thread_cpu_s": time.thread_time() - thread_cpu_start,
+                "phase": stack[-1] if stack else "startup",
+            }
+        )
+    return module
+
+
+@contextmanager
+def profile_phase(name):
+    """
+    Records the wall time, CPU time and memory of the wrapped block or function.
+    Phases can be nested; the allocations by package are only compared
+    against the startup snapshot when the outermost phase ends, and the
+    report is then written to disk. Imports done inside a phase are part of
+    its timings. CPU time is recorded both for the calling thread and for the
+    whole process, which includes the work of other concurrent sessions.
+
+    Args:
+        name: The name of the phase in the report (e.g. "create_agent").
+    """
+    global _active_phases
+
+    if not _enabled:
+        yield
+        return
+
+    stack = _phase_stack.get()
+    outermost = not stack
+    if outermost:
+        with _report_lock:
+            # The peak is process-wide: only reset it when no other session is busy
+            if _active_phases == 0:
+                tracemalloc.reset_peak()
+            _active_phases += 1
+    token = _phase_stack.set(stack + (name,))
+    memory_start = tracemalloc.get_traced_memory()[0]
+    wall_start = time.perf_counter()
+    thread_cpu_start, process_cpu_start = time.thread_time(), time.process_time()
+    try:
+        yield
+    finally:
+        wall_s = time.perf_counter() - wall_start
+        thread_cpu_s = time.thread_time() - thread_cpu_start
+        process_cpu_s = time.process_time() - process_cpu_start
+        memory_current, memory_peak = tracemalloc.get_traced_memory()
+        _phase_stack.reset(token)
+
+        phase = {
+            "phase": name,
+            "depth": len(stack),
+            "thread": threading.current_thread().name,
+            "wall_s": wall_s,
+            "thread_cpu_s": thread_cpu_s,
+            "process_cpu_s": process_cpu_s,
+            "memory_delta_mb": (memory_current - memory_start) / 1e6,
+            "traced_memory_mb": memory_current / 1e6,
+            "max_rss_mb": _max_rss_mb(),
+        }
+        if outermost:
+            phase["peak_memory_mb"] = memory_peak / 1e6
+            phase["growth_by_package"] = _growth_by_package()
+
+        with _report_lock:
+            _report["phases"].append(phase)
+            del _report["phases"][:-MAX_RECORDED_PHASES]
+            if outermost:
+                _active_phases -= 1
+                write_report()
+
+
+def write_report():
+    """
+    Writes the profiling report to PROFILE_REPORT_PATH as JSON.
+    """
+    with _report_lock:
+        report_dir = os.path.dirname(PROFILE_REPORT_PATH)
+        if report_dir and not os.path.exists(report_dir):
+            os.makedirs(report_dir)
+        with open(PROFILE_REPORT_PATH, "w", encoding="utf-8") as report_file:
+            json.dump(_report, report_file, indent=2)
+
+
+def load_report():
+    """
+    Loads the last profiling report written to disk.
+
+    Returns:
+        dict: The report, or None if no report was written yet.
+    """
+    if not os.path.exists(PROFILE_REPORT_PATH):
+        return None
+    with open(PROFILE_REPORT_PATH, encoding="utf-8") as report_file:
+        return json.load(report_file)
+
+
+def _growth_by_package():
+    """
+    Compares the current allocations with the startup snapshot and sums the
+    growth per top-level package (e.g. "faiss", "langchain_core", "torch").
+    """
+    snapshot = tracemalloc.take_snapshot()
+    growth = {}
+    for stat in snapshot.compare_to(_baseline_snapshot, "filename"):
+        package = _package_of(stat.traceback[0].filename)
+        growth[package] = growth.get(package, 0) + stat.size_diff
+
+    top = sorted(growth.items(), key=lambda item: item[1], reverse=True)
+    return [
+        {"package": package, "size_diff_mb": size / 1e6}
+        for package, size in top[:TOP_ALLOCATIONS]
+    ]
+
+
+def _package_of(filename):
+    """
+    Maps a source file to the package it belongs to.
+    """
+    parts = filename.replace("\\", "/").split("/")
+    for marker in ("site-packages", "dist-packages"):
+        if marker in parts:
+            position = parts.index(marker)
+            if position + 1 < len(parts):
+                return parts[position + 1].removesuffix(".py")
+    if "travel_planner" in parts:
+        return "travel_planner"
+    return filename if filename.startswith("<") else "other"
+
+
+def _max_rss_mb():
+    """
+    Returns the peak resident set size of the process in MB, or None.
+    Unlike tracemalloc, this includes native allocations (torch, FAISS).
+    """
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return max_rss / 1e6 if sys.platform == "darwin" else max_rss / 1e3
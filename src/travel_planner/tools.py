@@ -1,11 +1,21 @@
 import os
+import re
 
 import requests
 from langchain.tools import Tool
 from langchain.tools.retriever import create_retriever_tool
 
 from .config import load_openweathermap_api_key
-from .vector_store import load_vector_store
+from .profiling import profile_phase
+from .vector_store import (
+    book_index_exists,
+    book_index_is_stale,
+    create_book_index,
+    get_embeddings_model,
+    load_book_index,
+    load_vector_store,
+    roman_to_int,
+)
 
 
 def get_current_weather(location: str) -> str:
@@ -73,8 +83,11 @@ def ask_book_tool():
         A LangChain retriever tool.
     """
 
-    # Load the vector store
-    vector_store = load_vector_store()
+    # Load the embeddings model and the vector store, timed separately when profiling
+    with profile_phase("get_embeddings_model"):
+        embeddings = get_embeddings_model()
+    with profile_phase("load_vector_store"):
+        vector_store = load_vector_store(embeddings)
 
     # Create a retriever that fetches the top 3 most relevant text chunks
     retriever = vector_store.as_retriever(search_kwargs={"k": 3})
@@ -87,3 +100,120 @@ def ask_book_tool():
     )
 
     return tool
+
+
+def lookup_book_index(query: str, index: dict) -> str:
+    """
+    Answers a structured question about the book from the precomputed book index.
+    Supported queries are a chapter ("chapter 20", "chapter XX", "conclusion"),
+    a region ("Italy") or one or more places ("Rome and Naples", "Rome, Italy").
+    A region named alongside a place only qualifies it, and a region that
+    shares its name with a place (e.g. "Azores") lists all its places.
+
+    Args:
+        query: The chapter, place or region to look up.
+        index: The book index returned by load_book_index.
+
+    Returns:
+        A formatted string with the matching index entries or an error message.
+    """
+    normalized = query.strip().lower()
+
+    # Chapter lookups, by Arabic or Roman number
+    chapter_match = re.search(r"\bchapter\s+(\d+|[ivxlc]+)\b", normalized)
+    conclusion_match = re.fullmatch(r"(the\s+)?conclusion(\s+chapter)?\.?", normalized)
+    if chapter_match or conclusion_match:
+        if chapter_match:
+            number = chapter_match.group(1)
+            number = int(number) if number.isdigit() else roman_to_int(number.upper())
+            chapter = next(
+                (c for c in index["chapters"] if c["number"] == number), None
+            )
+        else:
+            chapter = next(
+                (c for c in index["chapters"] if c["heading"] == "CONCLUSION"), None
+            )
+        if chapter is None:
+            return f"Error: Chapter '{query}' not found in the book index."
+
+        result = f"{chapter['heading']} (chunks {chapter['chunks'][0]}-{chapter['chunks'][1]})"
+        if chapter["summary"]:
+            result += f": {chapter['summary']}"
+        places = ", ".join(chapter["places"]) if chapter["places"] else "none"
+        result += f"\nPlaces mentioned: {places}."
+        return result
+
+    # Regions listing several places, e.g. "Azores" (Azores, Fayal, Horta)
+    regions = [
+        region
+        for region, names in index["regions"].items()
+        if names != [region] and _mentions_name(normalized, region)
+    ]
+
+    # Place lookups, matched on the whole name. A place named like one of the
+    # regions above only counts when no other place is named.
+    named_places = [
+        name for name in index["places"] if _mentions_name(normalized, name)
+    ]
+    specific_places = [name for name in named_places if name not in regions]
+    if specific_places or not regions:
+        answers = []
+        for name in specific_places or named_places:
+            place = index["places"][name]
+            if not place["mentions"]:
+                answers.append(
+                    f"{name} ({place['region']}) is not mentioned in the book."
+                )
+                continue
+            chunks = sorted({mention[2] for mention in place["mentions"]})
+            answers.append(
+                f"{name} ({place['region']}) is mentioned {len(place['mentions'])} times"
+                f" in chapters {', '.join(map(str, place['chapters']))}."
+                f"\nChunk IDs: {', '.join(map(str, chunks))}."
+            )
+        if answers:
+            return "\n".join(answers)
+
+    # Region lookups list the places in the order Twain first mentions them
+    if regions:
+        lines = []
+        for region in regions:
+            lines.append(f"Places in {region}, in the order Twain mentions them:")
+            for name in index["regions"][region]:
+                chapters = ", ".join(map(str, index["places"][name]["chapters"]))
+                lines.append(f"- {name} (chapters {chapters})")
+        return "\n".join(lines)
+
+    return (
+        f"Error: '{query}' is not a chapter, place or region in the book index. "
+        f"Known regions are: {', '.join(index['regions'])}."
+    )
+
+
+def _mentions_name(normalized_query, name):
+    """
+    Checks if a lower-cased query contains a place or region name as whole words.
+    """
+    return re.search(rf"\b{re.escape(name.lower())}\b", normalized_query) is not None
+
+
+def book_index_tool():
+    """
+    Loads the book index and creates a LangChain tool for structured lookups.
+    The index is (re)built first if it is missing or does not match the vector
+    store any more, which needs no embeddings.
+
+    Returns:
+        A LangChain Tool.
+    """
+    if not book_index_exists() or book_index_is_stale(load_book_index()):
+        create_book_index()
+
+    # load_book_index is cached, so the index is only read from disk once
+    index = load_book_index()
+
+    return Tool(
+        name="lookup_book_index",
+        func=lambda query: lookup_book_index(query, index),
+        description="Looks up chapters, places and regions in Mark Twain's book 'The Innocents Abroad' from a precomputed index. Useful for structured questions such as which places Twain mentions in a country or which places appear in a chapter. Input should be a chapter (e.g., 'chapter 20'), a region (e.g., 'Italy') or one or more places (e.g., 'Rome and Naples').",
+    )
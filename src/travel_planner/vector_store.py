@@ -1,4 +1,9 @@
+import json
 import os
+import re
+import tempfile
+from bisect import bisect_right
+from functools import lru_cache
 
 from langchain.text_splitter import CharacterTextSplitter
 from langchain_community.document_loaders import TextLoader
@@ -7,6 +12,88 @@ from langchain_huggingface import HuggingFaceEmbeddings
 
 BOOK_PATH = "data/innocents_abroad_clean.txt"
 VECTOR_STORE_PATH = "data/vector_store"
+BOOK_INDEX_PATH = "data/book_index.json"
+CHUNK_SIZE = 1000
+CHUNK_OVERLAP = 100
+
+# Places mentioned along the Quaker City excursion's route (not all of them were
+# visited, e.g. the ship did not land at Madeira), mapped to the region they are
+# grouped under in the book index. Spellings follow the book (e.g. "Sphynx").
+BOOK_PLACES = {
+    "Azores": "Azores",
+    "Fayal": "Azores",
+    "Horta": "Azores",
+    "Gibraltar": "Gibraltar",
+    "Tangier": "Morocco",
+    "Cadiz": "Spain",
+    "Seville": "Spain",
+    "Malaga": "Spain",
+    "Madeira": "Madeira",
+    "Bermuda": "Bermuda",
+    "Marseilles": "France",
+    "Lyons": "France",
+    "Paris": "France",
+    "Versailles": "France",
+    "Genoa": "Italy",
+    "Milan": "Italy",
+    "Como": "Italy",
+    "Venice": "Italy",
+    "Florence": "Italy",
+    "Pisa": "Italy",
+    "Leghorn": "Italy",
+    "Civita Vecchia": "Italy",
+    "Rome": "Italy",
+    "Naples": "Italy",
+    "Pompeii": "Italy",
+    "Herculaneum": "Italy",
+    "Vesuvius": "Italy",
+    "Capri": "Italy",
+    "Ischia": "Italy",
+    "Messina": "Italy",
+    "Stromboli": "Italy",
+    "Sicily": "Italy",
+    "Sardinia": "Italy",
+    "Malta": "Malta",
+    "Piraeus": "Greece",
+    "Athens": "Greece",
+    "Corinth": "Greece",
+    "Constantinople": "Turkey",
+    "Bosporus": "Turkey",
+    "Smyrna": "Turkey",
+    "Ephesus": "Turkey",
+    "Sebastopol": "Russia",
+    "Odessa": "Russia",
+    "Yalta": "Russia",
+    "Beirut": "Syria",
+    "Baalbec": "Syria",
+    "Damascus": "Syria",
+    "Galilee": "Holy Land",
+    "Capernaum": "Holy Land",
+    "Tiberias": "Holy Land",
+    "Nazareth": "Holy Land",
+    "Jordan": "Holy Land",
+    "Jericho": "Holy Land",
+    "Dead Sea": "Holy Land",
+    "Jerusalem": "Holy Land",
+    "Bethlehem": "Holy Land",
+    "Jaffa": "Holy Land",
+    "Joppa": "Holy Land",
+    "Alexandria": "Egypt",
+    "Cairo": "Egypt",
+    "Pyramids": "Egypt",
+    "Sphynx": "Egypt",
+}
+
+# Body chapter headings sit on their own line, unlike the indented ones in the
+# table of contents. Patterns match on the encoded book so offsets are in bytes,
+# and accept CRLF line endings.
+CHAPTER_HEADING_PATTERN = re.compile(
+    rb"^(CHAPTER ([IVXLC]+)|CONCLUSION)\.\r?$", re.MULTILINE
+)
+TOC_ENTRY_PATTERN = re.compile(
+    rb"^ +CHAPTER ([IVXLC]+)\.?\r?\n(.+?)\r?\n\r?\n", re.MULTILINE | re.DOTALL
+)
+ROMAN_NUMERALS = {"I": 1, "V": 5, "X": 10, "L": 50, "C": 100}
 
 
 def get_embeddings_model():
@@ -39,8 +126,7 @@ def create_vector_store():
 
     # Split document into smaller chunks
     print("Splitting text into chunks...")
-    text_splitter = CharacterTextSplitter(chunk_size=1000, chunk_overlap=100)
-    docs = text_splitter.split_documents(documents)
+    docs = split_book_documents(documents)
 
     # Create embeddings
     print("Initializing Hugging Face embeddings model...")
@@ -56,11 +142,33 @@ def create_vector_store():
     database.save_local(VECTOR_STORE_PATH)
     print("Vector store (FAISS) saved successfully.")
 
+    # Build the structured chapter/place index from the same chunks
+    create_book_index(docs)
+
+
+def split_book_documents(documents):
+    """
+    Splits the loaded book into the chunks stored in the vector store.
+
+    Args:
+        documents: The documents returned by the book loader.
+
+    Returns:
+        list: The chunked documents, in book order.
+    """
+    text_splitter = CharacterTextSplitter(
+        chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP
+    )
+    return text_splitter.split_documents(documents)
+
 
-def load_vector_store():
+def load_vector_store(embeddings=None):
     """
     Loads the FAISS vector store from the local directory.
 
+    Args:
+        embeddings: The embeddings model to use. If not given, it is initialized.
+
     Returns:
         FAISS: The loaded vector store object, or None if it doesn't exist.
     """
@@ -70,7 +178,8 @@ def load_vector_store():
         )
 
     print("Loading vector store...")
-    embeddings = get_embeddings_model()
+    if embeddings is None:
+        embeddings = get_embeddings_model()
     database = FAISS.load_local(
         VECTOR_STORE_PATH, embeddings, allow_dangerous_deserialization=True
     )
@@ -91,5 +200,251 @@ def vector_store_exists():
     )
 
 
+def roman_to_int(numeral):
+    """
+    Converts a Roman numeral such as "XX" to an integer.
+    """
+    total = 0
+    for i, char in enumerate(numeral):
+        value = ROMAN_NUMERALS[char]
+        if i + 1 < len(numeral) and ROMAN_NUMERALS[numeral[i + 1]] > value:
+            total -= value
+        else:
+            total += value
+    return total
+
+
+def find_chunk_offsets(text, chunk_texts):
+    """
+    Finds the character offset of each chunk in the book text.
+
+    The splitter joins the pieces of a chunk with a single separator, so a
+    chunk that spans a longer run of blank lines is not a verbatim substring
+    of the book. Chunks are therefore matched with any run of whitespace
+    standing for any other, searching forward from the previous chunk.
+
+    Args:
+        text: The full book text.
+        chunk_texts: The text of each chunk, in chunk order.
+
+    Returns:
+        list: The character offset of each chunk, strictly increasing.
+    """
+    offsets = []
+    position = 0
+    for chunk_id, chunk_text in enumerate(chunk_texts):
+        pattern = r"\s+".join(map(re.escape, chunk_text.split()))
+        match = re.compile(pattern).search(text, position)
+        if match is None:
+            raise ValueError(f"Chunk {chunk_id} was not found in the book text.")
+        offsets.append(match.start())
+        position = match.start() + 1
+    return offsets
+
+
+def build_book_index(text, chunk_texts):
+    """
+    Builds the chapter and place index for the book text.
+
+    Chapters are mapped to their byte range in the book file, and every
+    mention of a place in BOOK_PLACES is recorded with its byte offset,
+    chapter and chunk ID. Mentions refer to chapters by number, or by
+    "CONCLUSION" for the closing section. Each chapter also lists the places it
+    mentions, and each region lists its places in order of first mention.
+    Chunk IDs are the positions of the chunks in the FAISS index, so they
+    can be resolved through the vector store's index_to_docstore_id mapping.
+    Mentions in the front matter (preface and table of contents) are not
+    indexed.
+
+    Args:
+        text: The full book text.
+        chunk_texts: The text of each chunk, in chunk order.
+
+    Returns:
+        dict: The book index, ready to be serialized as JSON.
+    """
+    encoded = text.encode("utf-8")
+
+    # Convert the chunk offsets from characters to bytes in a single pass
+    chunk_byte_starts = []
+    byte_offset, previous = 0, 0
+    for char_offset in find_chunk_offsets(text, chunk_texts):
+        byte_offset += len(text[previous:char_offset].encode("utf-8"))
+        previous = char_offset
+        chunk_byte_starts.append(byte_offset)
+
+    def to_chunk_id(offset):
+        return max(bisect_right(chunk_byte_starts, offset) - 1, 0)
+
+    # Chapter summaries come from the table of contents
+    summaries = {
+        roman_to_int(numeral.decode()): " ".join(summary.decode("utf-8").split())
+        for numeral, summary in TOC_ENTRY_PATTERN.findall(encoded)
+    }
+
+    headings = list(CHAPTER_HEADING_PATTERN.finditer(encoded))
+    if not headings:
+        raise ValueError("No chapter headings were found in the book text.")
+    chapters = []
+    for i, heading in enumerate(headings):
+        number = roman_to_int(heading.group(2).decode()) if heading.group(2) else None
+        end = headings[i + 1].start() if i + 1 < len(headings) else len(encoded)
+        chapters.append(
+            {
+                "number": number,
+                "heading": heading.group(1).decode(),
+                "summary": summaries.get(number),
+                "start": heading.start(),
+                "end": end,
+                "chunks": [to_chunk_id(heading.start()), to_chunk_id(end - 1)],
+            }
+        )
+    chapter_starts = [heading.start() for heading in headings]
+
+    # Longest names first so that e.g. "Civita Vecchia" wins over shorter names
+    names = sorted(BOOK_PLACES, key=len, reverse=True)
+    place_pattern = re.compile(
+        rb"\b(" + b"|".join(re.escape(name.encode()) for name in names) + rb")\b"
+    )
+
+    places = {
+        name: {"region": region, "mentions": []}
+        for name, region in BOOK_PLACES.items()
+    }
+    for match in place_pattern.finditer(encoded):
+        chapter_position = bisect_right(chapter_starts, match.start()) - 1
+        if chapter_position < 0:
+            continue
+        places[match.group(1).decode()]["mentions"].append(
+            [
+                match.start(),
+                _chapter_label(chapters[chapter_position]),
+                to_chunk_id(match.start()),
+            ]
+        )
+
+    # Precompute the chapter <-> place relations served by the lookup tool
+    # (mentions are in book order, so are the chapters listed for a place)
+    for name, place in places.items():
+        place["chapters"] = list(dict.fromkeys(m[1] for m in place["mentions"]))
+    for chapter in chapters:
+        chapter["places"] = [
+            name
+            for name, place in places.items()
+            if _chapter_label(chapter) in place["chapters"]
+        ]
+
+    # Regions list their places in the order Twain first mentions them
+    mentioned = [name for name, place in places.items() if place["mentions"]]
+    mentioned.sort(key=lambda name: places[name]["mentions"][0][0])
+    regions = {}
+    for name in mentioned:
+        regions.setdefault(places[name]["region"], []).append(name)
+
+    return {
+        "book_path": BOOK_PATH,
+        "chunk_size": CHUNK_SIZE,
+        "chunk_overlap": CHUNK_OVERLAP,
+        "chunk_count": len(chunk_texts),
+        "chapters": chapters,
+        "places": places,
+        "regions": regions,
+    }
+
+
+def _chapter_label(chapter):
+    """
+    Returns the number of a chapter, or its heading for the unnumbered CONCLUSION.
+    """
+    return chapter["number"] if chapter["number"] is not None else chapter["heading"]
+
+
+def create_book_index(docs=None):
+    """
+    Builds and saves the chapter/place index of the book.
+    This is an offline pass over the book text: no embeddings are computed.
+
+    Args:
+        docs: The chunks stored in the vector store. If not given, the book
+            is loaded and split again.
+    """
+    if not os.path.exists(BOOK_PATH):
+        raise FileNotFoundError(f"Book file not found at: {BOOK_PATH}")
+
+    if docs is None:
+        docs = split_book_documents(TextLoader(BOOK_PATH).load())
+
+    print("Building book index...")
+    with open(BOOK_PATH, "rb") as book_file:
+        text = book_file.read().decode("utf-8")
+    index = build_book_index(text, [doc.page_content for doc in docs])
+
+    # Write to a temporary file first so concurrent sessions never read a
+    # half-written index
+    index_dir = os.path.dirname(BOOK_INDEX_PATH) or "."
+    file_descriptor, temporary_path = tempfile.mkstemp(dir=index_dir, suffix=".tmp")
+    try:
+        with os.fdopen(file_descriptor, "w", encoding="utf-8") as index_file:
+            json.dump(index, index_file, separators=(",", ":"))
+        os.replace(temporary_path, BOOK_INDEX_PATH)
+    except BaseException:
+        os.remove(temporary_path)
+        raise
+    load_book_index.cache_clear()
+    print("Book index saved successfully.")
+
+
+@lru_cache(maxsize=1)
+def load_book_index():
+    """
+    Loads the chapter/place index of the book from disk.
+    The index is cached, so it is only read once per process.
+
+    Returns:
+        dict: The book index.
+    """
+    if not book_index_exists():
+        raise FileNotFoundError(
+            "Book index was not found in disk. Please create it first."
+        )
+
+    with open(BOOK_INDEX_PATH, encoding="utf-8") as index_file:
+        return json.load(index_file)
+
+
+def book_index_exists():
+    """
+    Checks if the book index file exists on disk.
+
+    Returns:
+        bool: True if the index exists, False otherwise.
+    """
+    return os.path.exists(BOOK_INDEX_PATH)
+
+
+def book_index_is_stale(index):
+    """
+    Checks if the book index no longer matches the chunks in the vector store,
+    either because the chunking settings changed or because the vector store
+    was rebuilt after the index.
+
+    Args:
+        index: The book index returned by load_book_index.
+
+    Returns:
+        bool: True if the index must be rebuilt, False otherwise.
+    """
+    if (index.get("chunk_size"), index.get("chunk_overlap")) != (
+        CHUNK_SIZE,
+        CHUNK_OVERLAP,
+    ):
+        return True
+
+    faiss_path = os.path.join(VECTOR_STORE_PATH, "index.faiss")
+    return vector_store_exists() and os.path.getmtime(faiss_path) > os.path.getmtime(
+        BOOK_INDEX_PATH
+    )
+
+
 if __name__ == "__main__":
    create_vector_store()
\ No newline at end of file
@@ -11,11 +11,13 @@ from src.travel_planner.agent import create_agent
 @patch("src.travel_planner.agent.ChatHuggingFace")
 @patch("src.travel_planner.agent.HuggingFaceEndpoint")
 @patch("src.travel_planner.agent.hub.pull")
+@patch("src.travel_planner.agent.book_index_tool")
 @patch("src.travel_planner.agent.ask_book_tool")
 @patch("src.travel_planner.agent.weather_tool", new_callable=MagicMock)
 def test_create_agent_assembles_components_correctly(
     mock_weather_tool,
     mock_ask_book_tool,
+    mock_book_index_tool,
     mock_hub_pull,
     mock_huggingface_endpoint,
     mock_chat_huggingface,
@@ -33,6 +35,9 @@ def test_create_agent_assembles_components_correctly(
     mock_book_tool = MagicMock()
     mock_book_tool.name = "ask_book"
     mock_ask_book_tool.return_value = mock_book_tool
+    mock_index_tool = MagicMock()
+    mock_index_tool.name = "lookup_book_index"
+    mock_book_index_tool.return_value = mock_index_tool
 
     # Mock the prompt pulled from LangChain Hub
     mock_prompt = MagicMock()
@@ -58,6 +63,7 @@ def test_create_agent_assembles_components_correctly(
 
     # Verify that the tool functions were called as expected
     mock_ask_book_tool.assert_called_once()
+    mock_book_index_tool.assert_called_once()
 
     # Verify the correct prompt was pulled from the hub
     mock_hub_pull.assert_called_once_with("hwchase17/structured-chat-agent")
@@ -88,6 +94,7 @@ def test_create_agent_assembles_components_correctly(
     assert call_args[0] == mock_chat_model_instance
     assert mock_weather_tool in call_args[1]
     assert mock_book_tool in call_args[1]
+    assert mock_index_tool in call_args[1]
 
     # Assert that the new prompt object returned by .partial() was used.
     assert call_args[2] is mock_partial_prompt
@@ -95,7 +102,7 @@ def test_create_agent_assembles_components_correctly(
     # Verify that the AgentExecutor was created and returned
     mock_agent_executor.assert_called_once_with(
         agent=mock_agent_instance,
-        tools=[mock_weather_tool, mock_book_tool],
+        tools=[mock_weather_tool, mock_book_tool, mock_index_tool],
         verbose=True,
         handle_parsing_errors=True,
     )
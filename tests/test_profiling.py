@@ -0,0 +1,174 @@
+import builtins
+import json
+import sys
+import threading
+import tracemalloc
+from unittest.mock import patch
+
+import pytest
+
+from src.travel_planner import profiling
+from src.travel_planner.profiling import profile_phase, start_profiling
+
+
+@pytest.fixture
+def profiling_report(tmp_path):
+    """
+    Gives each test a fresh report written to a temporary file, and stops
+    tracemalloc and the import hook afterwards.
+    """
+    report_path = tmp_path / "profile_report.json"
+    with patch.object(profiling, "PROFILE_REPORT_PATH", str(report_path)), patch.object(
+        profiling, "_report", {"imports": [], "phases": []}
+    ), patch.object(profiling, "_enabled", False), patch.object(
+        builtins, "__import__", builtins.__import__
+    ):
+        yield report_path
+    tracemalloc.stop()
+
+
+# --- PYTEST TEST FUNCTIONS ---
+@patch("src.travel_planner.profiling.load_profiling_enabled", return_value=False)
+def test_profiling_disabled_is_a_no_op(mock_enabled, profiling_report):
+    """
+    Tests that nothing is traced or written when profiling is not enabled.
+    """
+    # PYTHONTRACEMALLOC may already have started tracing, which must be left as is
+    was_tracing = tracemalloc.is_tracing()
+    start_profiling()
+
+    @profile_phase("query")
+    def answer():
+        return "answer"
+
+    assert answer() == "answer"
+    assert tracemalloc.is_tracing() == was_tracing
+    assert not profiling_report.exists()
+
+
+@patch("src.travel_planner.profiling.load_profiling_enabled", return_value=False)
+def test_profiling_disabled_with_tracemalloc_already_running(
+    mock_enabled, profiling_report
+):
+    """
+    Tests that phases stay a no-op when something else started tracemalloc
+    (e.g. PYTHONTRACEMALLOC=1) but profiling is not enabled.
+    """
+    tracemalloc.start()
+    start_profiling()
+
+    @profile_phase("query")
+    def answer():
+        return "answer"
+
+    assert answer() == "answer"
+    assert not profiling_report.exists()
+
+
+@patch("src.travel_planner.profiling.load_profiling_enabled", return_value=True)
+def test_profiling_enabled_with_tracemalloc_already_running(
+    mock_enabled, profiling_report
+):
+    """
+    Tests that profiling still takes its baseline and installs the import hook
+    when tracemalloc was already started.
+    """
+    tracemalloc.start()
+    start_profiling()
+    assert builtins.__import__ is profiling._timed_import
+
+    with profile_phase("query"):
+        pass
+
+    (phase,) = json.loads(profiling_report.read_text())["phases"]
+    assert phase["phase"] == "query"
+    assert "growth_by_package" in phase
+    assert phase["thread_cpu_s"] >= 0 and phase["process_cpu_s"] >= 0
+
+
+@patch("src.travel_planner.profiling.load_profiling_enabled", return_value=True)
+def test_profile_phase_records_nested_phases(mock_enabled, profiling_report):
+    """
+    Tests that nested phases are recorded and that the report is written
+    when the outermost phase ends.
+    """
+    start_profiling()
+
+    with profile_phase("query"):
+        with profile_phase("create_agent"):
+            data = [str(i) for i in range(10000)]
+
+    report = json.loads(profiling_report.read_text())
+    inner, outer = report["phases"]
+    assert (inner["phase"], inner["depth"]) == ("create_agent", 1)
+    assert (outer["phase"], outer["depth"]) == ("query", 0)
+    assert inner["memory_delta_mb"] > 0
+    assert outer["wall_s"] >= inner["wall_s"]
+
+    # Only the outermost phase is attributed to packages
+    assert "growth_by_package" not in inner
+    assert "peak_memory_mb" in outer
+    assert "other" in [entry["package"] for entry in outer["growth_by_package"]]
+    assert len(data) == 10000
+
+
+@patch.object(profiling, "PROFILED_IMPORTS", ["colorsys"])
+@patch("src.travel_planner.profiling.load_profiling_enabled", return_value=True)
+def test_imports_are_timed_in_the_phase_that_runs_them(mock_enabled, profiling_report):
+    """
+    Tests that heavy imports are not forced at startup, but timed when they
+    happen and attributed to the running phase.
+    """
+    with patch.dict(sys.modules):
+        sys.modules.pop("colorsys", None)
+        start_profiling()
+        assert "colorsys" not in sys.modules
+
+        with profile_phase("get_embeddings_model"):
+            import colorsys
+
+    (entry,) = json.loads(profiling_report.read_text())["imports"]
+    assert entry["module"] == "colorsys"
+    assert entry["phase"] == "get_embeddings_model"
+    assert entry["wall_s"] >= 0
+
+
+@patch("src.travel_planner.profiling.load_profiling_enabled", return_value=True)
+def test_profile_phase_tracks_depth_per_thread(mock_enabled, profiling_report):
+    """
+    Tests that concurrent sessions (threads) do not mix up each other's phases.
+    """
+    start_profiling()
+    barrier = threading.Barrier(2)
+
+    def run_query():
+        with profile_phase("query"):
+            barrier.wait()
+            with profile_phase("create_agent"):
+                barrier.wait()
+
+    threads = [threading.Thread(target=run_query) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    phases = json.loads(profiling_report.read_text())["phases"]
+    depths = sorted((phase["phase"], phase["depth"]) for phase in phases)
+    assert depths == [("create_agent", 1)] * 2 + [("query", 0)] * 2
+    assert all(
+        ("growth_by_package" in phase) == (phase["depth"] == 0) for phase in phases
+    )
+    assert profiling._active_phases == 0
+
+
+def test_package_of():
+    """
+    Tests that source files are attributed to their top-level package.
+    """
+    assert (
+        profiling._package_of("/venv/lib/python3.11/site-packages/faiss/loader.py")
+        == "faiss"
+    )
+    assert profiling._package_of("/venv/lib/site-packages/six.py") == "six"
+    assert profiling._package_of("/repo/src/travel_planner/agent.py") == "travel_planner"
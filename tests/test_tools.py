@@ -3,7 +3,12 @@ from unittest.mock import MagicMock, patch
 import pytest
 import requests
 
-from src.travel_planner.tools import ask_book_tool, get_current_weather
+from src.travel_planner.tools import (
+    ask_book_tool,
+    book_index_tool,
+    get_current_weather,
+    lookup_book_index,
+)
 
 # --- MOCK API RESPONSES ---
 # This dictionary simulates a successful API response from OpenWeatherMap
@@ -15,6 +20,33 @@ MOCK_WEATHER_SUCCESS = {
     "cod": 200,
 }
 
+# This dictionary simulates a small index built by build_book_index
+MOCK_BOOK_INDEX = {
+    "chapters": [
+        {
+            "number": 20,
+            "heading": "CHAPTER XX",
+            "summary": "Rural Italy by Rail",
+            "start": 100,
+            "end": 200,
+            "chunks": [3, 5],
+            "places": ["Milan", "Como"],
+        }
+    ],
+    "places": {
+        "Milan": {"region": "Italy", "mentions": [[120, 20, 3]], "chapters": [20]},
+        "Como": {
+            "region": "Italy",
+            "mentions": [[150, 20, 4], [160, 20, 4]],
+            "chapters": [20],
+        },
+        "Rome": {"region": "Italy", "mentions": [[300, 26, 8]], "chapters": [26]},
+        "Azores": {"region": "Azores", "mentions": [[10, 5, 1]], "chapters": [5]},
+        "Fayal": {"region": "Azores", "mentions": [[20, 5, 1]], "chapters": [5]},
+    },
+    "regions": {"Azores": ["Azores", "Fayal"], "Italy": ["Milan", "Como", "Rome"]},
+}
+
 
 # --- PYTEST TEST FUNCTIONS for Weather Tool ---
 @patch("requests.get")
@@ -84,7 +116,10 @@ def test_get_current_weather_generic_network_error(mock_get):
 
 @patch("src.travel_planner.tools.create_retriever_tool")
 @patch("src.travel_planner.tools.load_vector_store")
-def test_ask_book_tool_creation(mock_load_vector_store, mock_create_retriever_tool):
+@patch("src.travel_planner.tools.get_embeddings_model")
+def test_ask_book_tool_creation(
+    mock_get_embeddings_model, mock_load_vector_store, mock_create_retriever_tool
+):
     """
     Tests the creation of the book tool.
     Mocks the vector store loading and the final tool creation to verify
@@ -103,8 +138,10 @@ def test_ask_book_tool_creation(mock_load_vector_store, mock_create_retriever_to
     ask_book_tool()
 
     # --- Assertions ---
-    # 1. Verify that our code attempted to load the vector store
-    mock_load_vector_store.assert_called_once()
+    # 1. Verify that our code loaded the vector store with the embeddings model
+    mock_load_vector_store.assert_called_once_with(
+        mock_get_embeddings_model.return_value
+    )
 
     # 2. Verify that it created a retriever from the store with the correct settings
     mock_vector_store.as_retriever.assert_called_once_with(search_kwargs={"k": 3})
@@ -116,3 +153,109 @@ def test_ask_book_tool_creation(mock_load_vector_store, mock_create_retriever_to
         name="ask_book",
         description="Finds and returns the most relevant passages from Mark Twain's book, 'The Innocents Abroad'. Useful for any questions about the content of the book 'The Innocents Abroad' by Mark Twain, Mark Twain's opinions, his travels, or the places and people he described.",
     )
+
+
+# --- PYTEST TEST FUNCTIONS for Book Index Tool ---
+
+
+def test_lookup_book_index_chapter():
+    """
+    Tests that chapters can be looked up by Arabic or Roman number.
+    """
+    for query in ["chapter 20", "Chapter XX"]:
+        result = lookup_book_index(query, MOCK_BOOK_INDEX)
+        assert "CHAPTER XX (chunks 3-5): Rural Italy by Rail" in result
+        assert "Places mentioned: Milan, Como." in result
+
+    assert "not found" in lookup_book_index("chapter 99", MOCK_BOOK_INDEX)
+
+
+def test_lookup_book_index_place_and_region():
+    """
+    Tests the place and region lookups, and the message for unknown queries.
+    """
+    result = lookup_book_index("Como", MOCK_BOOK_INDEX)
+    assert result == "Como (Italy) is mentioned 2 times in chapters 20.\nChunk IDs: 4."
+
+    result = lookup_book_index(
+        "Which cities did Twain visit in Italy?", MOCK_BOOK_INDEX
+    )
+    assert result.splitlines() == [
+        "Places in Italy, in the order Twain mentions them:",
+        "- Milan (chapters 20)",
+        "- Como (chapters 20)",
+        "- Rome (chapters 26)",
+    ]
+
+    assert "Known regions are: Azores, Italy." in lookup_book_index(
+        "Atlantis", MOCK_BOOK_INDEX
+    )
+
+
+def test_lookup_book_index_region_named_like_a_place_and_several_places():
+    """
+    Tests that a region sharing its name with a place lists all its places,
+    and that a query naming several places answers for each of them.
+    """
+    result = lookup_book_index("places in the Azores", MOCK_BOOK_INDEX)
+    assert result.splitlines()[1:] == ["- Azores (chapters 5)", "- Fayal (chapters 5)"]
+
+    # A region named next to a place only qualifies it
+    result = lookup_book_index("Fayal, Azores", MOCK_BOOK_INDEX)
+    assert result.startswith("Fayal (Azores) is mentioned 1 times")
+
+    result = lookup_book_index("Milan and Como", MOCK_BOOK_INDEX)
+    assert result.startswith("Milan (Italy) is mentioned 1 times")
+    assert "Como (Italy) is mentioned 2 times" in result
+
+
+@patch("src.travel_planner.tools.create_book_index")
+@patch("src.travel_planner.tools.book_index_exists", return_value=False)
+@patch("src.travel_planner.tools.load_book_index", return_value=MOCK_BOOK_INDEX)
+def test_book_index_tool_creation(
+    mock_load_book_index, mock_book_index_exists, mock_create_book_index
+):
+    """
+    Tests that the book index tool builds a missing index, loads it once and
+    serves lookups from it.
+    """
+    tool = book_index_tool()
+
+    mock_create_book_index.assert_called_once()
+    mock_load_book_index.assert_called_once()
+    assert tool.name == "lookup_book_index"
+    assert tool.func("Milan").startswith("Milan (Italy)")
+
+
+@patch("src.travel_planner.tools.create_book_index")
+@patch("src.travel_planner.tools.book_index_is_stale", return_value=True)
+@patch("src.travel_planner.tools.book_index_exists", return_value=True)
+@patch("src.travel_planner.tools.load_book_index", return_value=MOCK_BOOK_INDEX)
+def test_book_index_tool_rebuilds_stale_index(
+    mock_load_book_index,
+    mock_book_index_exists,
+    mock_book_index_is_stale,
+    mock_create_book_index,
+):
+    """
+    Tests that an index that no longer matches the vector store is rebuilt.
+    """
+    book_index_tool()
+
+    mock_book_index_is_stale.assert_called_once_with(MOCK_BOOK_INDEX)
+    mock_create_book_index.assert_called_once()
+
+
+def test_lookup_book_index_place_with_region_qualifier():
+    """
+    Tests that a place qualified by its region answers for the place, and that
+    the word "conclusion" inside a question does not select the CONCLUSION.
+    """
+    result = lookup_book_index("Rome, Italy", MOCK_BOOK_INDEX)
+    assert result == "Rome (Italy) is mentioned 1 times in chapters 26.\nChunk IDs: 8."
+    assert "Places in Italy" not in result
+
+    result = lookup_book_index(
+        "What is the conclusion Twain draws on Como?", MOCK_BOOK_INDEX
+    )
+    assert result.startswith("Como (Italy) is mentioned 2 times")
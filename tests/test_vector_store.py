@@ -4,8 +4,11 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 from src.travel_planner.vector_store import (
+    build_book_index,
     create_vector_store,
+    find_chunk_offsets,
     load_vector_store,
+    split_book_documents,
     vector_store_exists,
 )
 
@@ -26,6 +29,7 @@ def test_vector_store_exists(mock_exists):
     assert vector_store_exists() == False
 
 
+@patch("src.travel_planner.vector_store.create_book_index")
 @patch("src.travel_planner.vector_store.TextLoader")
 @patch("src.travel_planner.vector_store.CharacterTextSplitter")
 @patch("src.travel_planner.vector_store.HuggingFaceEmbeddings")
@@ -33,7 +37,13 @@ def test_vector_store_exists(mock_exists):
 @patch("os.path.exists", return_value=True)  # Assume book file exists
 @patch("os.makedirs")
 def test_create_vector_store_logic(
-    mock_makedirs, mock_exists, mock_faiss, mock_embeddings, mock_splitter, mock_loader
+    mock_makedirs,
+    mock_exists,
+    mock_faiss,
+    mock_embeddings,
+    mock_splitter,
+    mock_loader,
+    mock_create_book_index,
 ):
     """
     Tests the logic of create_vector_store.
@@ -45,9 +55,10 @@ def test_create_vector_store_logic(
     mock_loader.return_value.load.return_value = [
         MagicMock()
     ]  # Simulate loaded documents
-    mock_splitter.return_value.split_documents.return_value = [
-        MagicMock()
-    ]  # Simulate split docs
+    mock_docs = [MagicMock()]
+    mock_splitter.return_value.split_documents.return_value = (
+        mock_docs  # Simulate split docs
+    )
     mock_embeddings.return_value = MagicMock()  # Simulate embeddings model
 
     mock_db_instance = MagicMock()
@@ -62,3 +73,119 @@ def test_create_vector_store_logic(
     mock_splitter.return_value.split_documents.assert_called_once()
     mock_faiss.from_documents.assert_called_once()
     mock_db_instance.save_local.assert_called_once()
+
+    # The book index is built from the same chunks as the vector store
+    mock_create_book_index.assert_called_once_with(mock_docs)
+
+
+def test_build_book_index():
+    """
+    Tests that build_book_index maps chapters and place mentions to byte
+    offsets, chapter numbers and chunk IDs.
+    """
+    # A small book with a table of contents, a non-ASCII character and two chapters
+    text = (
+        "\n    CHAPTER I.\nLeaving Home\n\n"
+        "    CHAPTER II.\nRome\n\n"
+        "CHAPTER I.\n\nWe sailed for the Azores. \u201cFine\u201d weather.\n\n"
+        "CHAPTER II.\n\nRome at last, then Naples and the Azores again.\n"
+    )
+    first_chapter = text.index("CHAPTER I.\n\n")
+    second_chapter = text.index("CHAPTER II.\n\n")
+    chunk_texts = [
+        text[:first_chapter].strip(),
+        text[first_chapter:second_chapter].strip(),
+        text[second_chapter:].strip(),
+    ]
+    index = build_book_index(text, chunk_texts)
+    encoded = text.encode("utf-8")
+
+    # Chapters carry their table of contents summary and byte range
+    chapters = index["chapters"]
+    assert [chapter["number"] for chapter in chapters] == [1, 2]
+    assert chapters[0]["summary"] == "Leaving Home"
+    assert encoded[chapters[1]["start"] :].startswith(b"CHAPTER II.")
+    assert chapters[1]["end"] == len(encoded)
+    assert chapters[1]["places"] == ["Azores", "Rome", "Naples"]
+
+    # Mentions in the table of contents are not indexed
+    rome = index["places"]["Rome"]
+    assert len(rome["mentions"]) == 1
+    offset, chapter, chunk_id = rome["mentions"][0]
+    assert encoded[offset:].startswith(b"Rome at last")
+    assert chapter == 2
+    assert chunk_id == 2
+    assert index["places"]["Azores"]["chapters"] == [1, 2]
+
+    # Regions list places in order of first mention
+    assert index["regions"] == {"Azores": ["Azores"], "Italy": ["Rome", "Naples"]}
+
+
+
+def test_build_book_index_conclusion_and_crlf():
+    """
+    Tests that the CONCLUSION is referenced the same way from places and
+    chapters, that CRLF line endings are supported, and that a text without
+    chapter headings is rejected.
+    """
+    text = (
+        "\r\n    CHAPTER I.\r\nLeaving Home\r\n\r\n"
+        "CHAPTER I.\r\n\r\nWe reached Rome.\r\n\r\n"
+        "CONCLUSION.\r\n\r\nRome again.\r\n"
+    )
+    index = build_book_index(text, [text.strip()])
+
+    chapters = index["chapters"]
+    assert [chapter["heading"] for chapter in chapters] == ["CHAPTER I", "CONCLUSION"]
+    assert chapters[0]["summary"] == "Leaving Home"
+    assert chapters[1]["places"] == ["Rome"]
+    assert index["places"]["Rome"]["chapters"] == [1, "CONCLUSION"]
+
+    with pytest.raises(ValueError):
+        build_book_index("No chapters here, only Rome.", ["No chapters here, only Rome."])
+
+
+def test_find_chunk_offsets_tolerates_whitespace():
+    """
+    Tests that chunks are found even when the splitter collapsed a run of
+    blank lines, and that a missing chunk raises an error.
+    """
+    text = "First paragraph.\n\n\n\nSecond paragraph.\n\nThird."
+    chunk_texts = [
+        "First paragraph.\n\nSecond paragraph.",
+        "Second paragraph.\n\nThird.",
+    ]
+    assert find_chunk_offsets(text, chunk_texts) == [0, text.index("Second")]
+
+    with pytest.raises(ValueError):
+        find_chunk_offsets(text, ["Not in the book."])
+
+
+def test_book_index_chunk_ids_with_real_splitter():
+    """
+    Tests with the real splitter that every place mention points to a chunk
+    containing the place, even across runs of 4+ newlines.
+    """
+    from langchain_core.documents import Document
+
+    paragraphs = [
+        f"CHAPTER {numeral}.\n\n"
+        + f"We reached {place} on day {day}. " * 20
+        + "\n\n\n\n"
+        + "Nothing of note happened at sea. " * 20
+        for day, (numeral, place) in enumerate(
+            [("I", "Gibraltar"), ("II", "Paris"), ("III", "Rome"), ("IV", "Athens")]
+        )
+    ]
+    text = "\n\n\n\n".join(paragraphs)
+    docs = split_book_documents([Document(page_content=text)])
+    assert len(docs) > 4
+
+    index = build_book_index(text, [doc.page_content for doc in docs])
+    encoded = text.encode("utf-8")
+    for name in ["Gibraltar", "Paris", "Rome", "Athens"]:
+        mentions = index["places"][name]["mentions"]
+        assert len(mentions) == 20
+        for offset, chapter, chunk_id in mentions:
+            assert encoded[offset:].startswith(name.encode())
+            assert name in docs[chunk_id].page_content